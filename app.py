@@ -24,25 +24,228 @@ Requirements:
 """
 
 import streamlit as st
+import hashlib
 import importlib.util
+import json
 import sys
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+
+@st.cache_resource(show_spinner=False)
+def _load_stock_analyst():
+    """
+    Import the main module (handles filename with hyphens).
+
+    This approach is necessary because Python module names cannot contain
+    hyphens. The module is loaded once per process rather than on every
+    Streamlit rerun.
+    """
+    module_path = Path(__file__).parent / "multi-agent-stock-analyst.py"
+    spec = importlib.util.spec_from_file_location("stock_analyst", module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["stock_analyst"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+stock_analyst = _load_stock_analyst()
+initialize_agent = stock_analyst.initialize_agent
+analyze_stock = stock_analyst.analyze_stock
+get_ml_prediction = stock_analyst.get_ml_prediction
+get_technical_analysis = stock_analyst.get_technical_analysis
+get_fundamental_health = stock_analyst.get_fundamental_health
+
+
+# ============================================================================
+# Cached agent calls
+# ============================================================================
+# Streamlit reruns this script on every interaction, so per-ticker agent data
+# is cached briefly to avoid re-hitting Yahoo Finance and refitting the model.
+# The caches are shared across sessions, so failures are raised inside the
+# cached functions (st.cache_data doesn't store exceptions) and only
+# successful results are kept.
+
+class _AgentFailure(Exception):
+    """Carries a failed result out of a cached function so it isn't cached."""
+
+
+def _raise_on_error(data: dict) -> dict:
+    """
+    Pass an agent result through, raising _AgentFailure for an error dict.
+
+    Args:
+        data (dict): Agent result dictionary
+
+    Returns:
+        dict: The same result, if it is not an error
+    """
+    if "error" in data:
+        raise _AgentFailure(data)
+    return data
+
+
+@st.cache_data(ttl="1m", max_entries=256, show_spinner=False)
+def _ml_data(ticker: str) -> dict:
+    """Cached wrapper around get_ml_prediction (successes only)."""
+    return _raise_on_error(get_ml_prediction(ticker))
+
+
+@st.cache_data(ttl="1m", max_entries=256, show_spinner=False)
+def _tech_data(ticker: str) -> dict:
+    """Cached wrapper around get_technical_analysis (successes only)."""
+    return _raise_on_error(get_technical_analysis(ticker))
+
+
+@st.cache_data(ttl="10m", max_entries=256, show_spinner=False)
+def _fund_data(ticker: str) -> dict:
+    """Cached wrapper around get_fundamental_health (successes only)."""
+    return _raise_on_error(get_fundamental_health(ticker))
+
+
+def _agent_data(cached_fn, ticker: str) -> dict:
+    """
+    Get an agent result through its cached wrapper, or its error dict.
+
+    Args:
+        cached_fn (callable): One of _ml_data, _tech_data, _fund_data
+        ticker (str): Stock ticker symbol
+
+    Returns:
+        dict: Agent result dictionary, possibly with an "error" field
+    """
+    try:
+        return cached_fn(ticker)
+    except _AgentFailure as e:
+        return e.args[0]
+
+
+def _cached_ml(ticker: str) -> dict:
+    """ML agent data, cached on success."""
+    return _agent_data(_ml_data, ticker)
+
+
+def _cached_tech(ticker: str) -> dict:
+    """Technical agent data, cached on success."""
+    return _agent_data(_tech_data, ticker)
+
+
+def _cached_fund(ticker: str) -> dict:
+    """Fundamental agent data, cached on success."""
+    return _agent_data(_fund_data, ticker)
+
+
+@st.cache_data(ttl="1h", max_entries=256, show_spinner=False)
+def _cached_recommendation(ticker: str, data_digest: str, _chat) -> str:
+    """
+    Cached wrapper around analyze_stock.
+
+    Keyed by ticker and a digest of the agent data, so a recommendation is
+    reused until the underlying numbers change. The chat instance is not
+    hashable, so it is excluded from the cache key (leading underscore).
+
+    Raises:
+        _AgentFailure: If analyze_stock returned an error message; the
+            cache is shared across sessions, so one user's failure (e.g. an
+            invalid or over-quota key) must not be served to others
+    """
+    recommendation = analyze_stock(ticker, _chat)
+    if recommendation.startswith("Agent Error:"):
+        raise _AgentFailure(recommendation)
+    return recommendation
+
+
+def _cached_analyze(ticker: str, chat) -> str:
+    """
+    Get the AI recommendation for a ticker, reusing a cached response when
+    the ML, technical, and fundamental data are unchanged.
+    """
+    agent_data = [_cached_ml(ticker), _cached_tech(ticker), _cached_fund(ticker)]
+    data_digest = hashlib.sha256(
+        json.dumps(agent_data, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    try:
+        return _cached_recommendation(ticker, data_digest, chat)
+    except _AgentFailure as e:
+        return str(e)
+
+
+def _to_json(data: dict) -> str:
+    """
+    Serialize agent data to indented JSON for display.
+
+    Args:
+        data (dict): Agent result dictionary
+
+    Returns:
+        str: Pretty-printed JSON
+    """
+    return orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    ).decode('utf-8')
+
+
+def _show_agent_data(data: dict):
+    """
+    Display an agent result, or its error message.
+
+    Args:
+        data (dict): Agent result dictionary
+    """
+    if "error" in data:
+        st.error(data["error"])
+    else:
+        st.code(_to_json(data), language="json")
+
+
+# Each agent panel is its own fragment and refreshes on a timer; new numbers
+# appear as the underlying cache entries expire, without rerunning the script
+# or the AI recommendation.
+
+@st.fragment(run_every="30s")
+def ml_panel(ticker: str):
+    """Render the ML Agent panel for a ticker."""
+    st.markdown("### 🤖 ML Agent")
+    _show_agent_data(_cached_ml(ticker))
+
+
+@st.fragment(run_every="30s")
+def tech_panel(ticker: str):
+    """Render the Technical Agent panel for a ticker."""
+    st.markdown("### 📉 Technical Agent")
+    _show_agent_data(_cached_tech(ticker))
+
+
+@st.fragment(run_every="30s")
+def fund_panel(ticker: str):
+    """Render the Fundamental Agent panel for a ticker."""
+    st.markdown("### 💼 Fundamental Agent")
+    _show_agent_data(_cached_fund(ticker))
+
+
+def render_agent_details(ticker: str):
+    """
+    Render the detailed agent data panel for a ticker.
+
+    Args:
+        ticker (str): Stock ticker symbol (e.g., 'AAPL', 'MSFT')
+    """
+    with st.expander("📈 View Detailed Agent Data"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            ml_panel(ticker)
+        
+        with col2:
+            tech_panel(ticker)
+        
+        with col3:
+            fund_panel(ticker)
 
-# Import the main module (handles filename with hyphens)
-# This approach is necessary because Python module names cannot contain hyphens
-module_path = Path(__file__).parent / "multi-agent-stock-analyst.py"
-spec = importlib.util.spec_from_file_location("stock_analyst", module_path)
-stock_analyst = importlib.util.module_from_spec(spec)
-sys.modules["stock_analyst"] = stock_analyst
-spec.loader.exec_module(stock_analyst)
-
-from stock_analyst import (
-    initialize_agent,
-    analyze_stock,
-    get_ml_prediction,
-    get_technical_analysis,
-    get_fundamental_health
-)
 
 # Configure Streamlit page
 st.set_page_config(
@@ -98,25 +301,21 @@ with st.sidebar:
     # Store API key in session state
     if api_key_input:
         st.session_state.api_key = api_key_input
-        # Reset chat if API key changes
-        if 'previous_api_key' not in st.session_state or st.session_state.previous_api_key != api_key_input:
-            if 'chat' in st.session_state:
-                del st.session_state.chat
-            st.session_state.previous_api_key = api_key_input
     
-    # Initialize or reinitialize agent when API key is provided
+    # Start a chat for this session when the API key changes; chats keep
+    # mutable history, so each session has its own (the underlying model is
+    # built once per key and shared)
     if api_key_input and api_key_input.strip():
-        if 'chat' not in st.session_state:
-            try:
+        try:
+            if 'chat' not in st.session_state or st.session_state.get('chat_key') != api_key_input.strip():
                 with st.spinner("Initializing AI Agent..."):
                     st.session_state.chat = initialize_agent(api_key_input.strip())
-                st.success("✅ AI Agent Online")
-            except Exception as e:
-                st.error(f"❌ Failed to initialize agent: {str(e)}")
-                if 'chat' in st.session_state:
-                    del st.session_state.chat
-        else:
+                st.session_state.chat_key = api_key_input.strip()
             st.success("✅ AI Agent Ready")
+        except Exception as e:
+            st.error(f"❌ Failed to initialize agent: {str(e)}")
+            if 'chat' in st.session_state:
+                del st.session_state.chat
     else:
         st.warning("⚠️ Please enter your Google API key to continue")
         if 'chat' in st.session_state:
@@ -152,8 +351,24 @@ if analyze_button and ticker_input:
         # Perform analysis with loading indicator
         with st.spinner(f"🔍 Analyzing {ticker}... This may take a moment."):
             try:
+                # Run the AI recommendation and the agent data fetches
+                # concurrently; worker threads inherit the script context
+                # for st.cache_data
+                executor = ThreadPoolExecutor(
+                    max_workers=4,
+                    initializer=add_script_run_ctx,
+                    initargs=(None, get_script_run_ctx())
+                )
+                f_llm = executor.submit(_cached_analyze, ticker, st.session_state.chat)
+                # Warm the agent data caches for the detail panel
+                executor.submit(_cached_ml, ticker)
+                executor.submit(_cached_tech, ticker)
+                executor.submit(_cached_fund, ticker)
+                # Don't block here; the detail panel reads the warmed caches
+                executor.shutdown(wait=False)
+
                 # Get AI-generated recommendation
-                recommendation = analyze_stock(ticker, st.session_state.chat)
+                recommendation = f_llm.result()
                 
                 # Display main recommendation
                 st.markdown("---")
@@ -161,35 +376,7 @@ if analyze_button and ticker_input:
                 st.markdown(recommendation)
                 
                 # Display detailed agent data in expandable section
-                with st.expander("📈 View Detailed Agent Data"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    # ML Agent data
-                    with col1:
-                        st.markdown("### 🤖 ML Agent")
-                        ml_data = get_ml_prediction(ticker)
-                        if "error" in ml_data:
-                            st.error(ml_data["error"])
-                        else:
-                            st.json(ml_data)
-                    
-                    # Technical Agent data
-                    with col2:
-                        st.markdown("### 📉 Technical Agent")
-                        tech_data = get_technical_analysis(ticker)
-                        if "error" in tech_data:
-                            st.error(tech_data["error"])
-                        else:
-                            st.json(tech_data)
-                    
-                    # Fundamental Agent data
-                    with col3:
-                        st.markdown("### 💼 Fundamental Agent")
-                        fund_data = get_fundamental_health(ticker)
-                        if "error" in fund_data:
-                            st.error(fund_data["error"])
-                        else:
-                            st.json(fund_data)
+                render_agent_details(ticker)
             
             except Exception as e:
                 st.error(f"❌ Error analyzing {ticker}: {str(e)}")
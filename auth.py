@@ -7,10 +7,17 @@ Handles user registration, email verification, password management,
 and session management.
 """
 
+import os
 import sqlite3
 import secrets
+import hashlib
+import threading
+import queue
 import bcrypt
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Tuple
 from urllib.parse import quote
 from email_validator import validate_email, EmailNotValidError
@@ -30,76 +37,145 @@ class AuthError(Exception):
     pass
 
 
-def get_db_connection():
+# Database connections pooled for the life of the process. Streamlit runs
+# each rerun on a new thread, so connections are checked out per call rather
+# than held per thread.
+_DB_POOL_SIZE = 4
+_db_pool = queue.LifoQueue()
+_db_slots = threading.BoundedSemaphore(_DB_POOL_SIZE)
+
+
+def _open_db_connection() -> sqlite3.Connection:
     """
-    Get a database connection.
+    Open a database connection in WAL mode.
 
     Returns:
         sqlite3.Connection: Database connection
     """
-    conn = sqlite3.connect(config.DATABASE_FILE)
+    conn = sqlite3.connect(config.DATABASE_FILE, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
+@contextmanager
+def get_db_connection():
+    """
+    Check out a pooled database connection for the duration of a with block.
+
+    At most _DB_POOL_SIZE connections are open; each is opened once, in WAL
+    mode so readers are not blocked by concurrent writers, and reused by
+    later calls from any thread. Its statement cache keeps every query in
+    this module prepared after first use, so repeated lookups skip SQL
+    parsing. A transaction left open by the block is rolled back.
+
+    Yields:
+        sqlite3.Connection: Database connection
+    """
+    with _db_slots:
+        try:
+            conn = _db_pool.get_nowait()
+        except queue.Empty:
+            conn = _open_db_connection()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            _db_pool.put(conn)
+
+
+# Bump when the DDL in init_database changes
+_SCHEMA_VERSION = 1
+_initialized = False
+
+
 def init_database():
     """
     Initialize the database with required tables.
+
+    The DDL runs at most once per database file (tracked with PRAGMA
+    user_version) and the check itself at most once per process.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Create users table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT,
-            is_verified INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Create email_verification_tokens table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS email_verification_tokens (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            token TEXT UNIQUE NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            used_at TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """)
-
-    # Create password_reset_tokens table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS password_reset_tokens (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            token TEXT UNIQUE NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            used_at TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """)
-
-    # Create indexes for better performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_token ON email_verification_tokens(token)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reset_token ON password_reset_tokens(token)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_email ON users(email)")
-
-    conn.commit()
-    conn.close()
+    global _initialized
+
+    if _initialized:
+        return
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            _initialized = True
+            return
+
+        # Create users table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT UNIQUE NOT NULL,
+                password_hash TEXT,
+                is_verified INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Create email_verification_tokens table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS email_verification_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                token BLOB UNIQUE NOT NULL,
+                expires_at TIMESTAMP NOT NULL,
+                used_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        """)
+
+        # Create password_reset_tokens table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS password_reset_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                token BLOB UNIQUE NOT NULL,
+                expires_at TIMESTAMP NOT NULL,
+                used_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        """)
+
+        # Create indexes for better performance
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_token ON email_verification_tokens(token)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reset_token ON password_reset_tokens(token)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_email ON users(email)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_verification_token_live
+            ON email_verification_tokens(token, used_at, expires_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reset_token_live
+            ON password_reset_tokens(token, used_at, expires_at)
+        """)
+
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+        conn.commit()
+        _initialized = True
 
 
+@lru_cache(maxsize=1024)
 def validate_email_format(email: str) -> bool:
     """
     Validate email format.
 
+    Only the syntax is checked; DNS deliverability lookups are skipped to
+    keep a network round-trip off the sign-up path.
+
     Args:
         email (str): Email address to validate
 
@@ -107,12 +183,35 @@ def validate_email_format(email: str) -> bool:
         bool: True if valid, False otherwise
     """
     try:
-        validate_email(email)
+        validate_email(email, check_deliverability=False)
         return True
     except EmailNotValidError:
         return False
 
 
+def _hash_concurrency() -> int:
+    """
+    Get how many bcrypt hashes may run at once.
+
+    os.cpu_count() reports the host's CPUs, not the ones available to this
+    process, so the configured limit is used if set, else the CPU affinity.
+
+    Returns:
+        int: Concurrent hash limit, at least 1
+    """
+    if config.BCRYPT_CONCURRENCY > 0:
+        return config.BCRYPT_CONCURRENCY
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+# bcrypt releases the GIL, so concurrent sessions hash in parallel; cap that
+# at one hash per available core so a burst of sign-ups can't starve every
+# other session
+_kdf_slots = threading.BoundedSemaphore(_hash_concurrency())
+
+
 def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt.
@@ -123,7 +222,12 @@ def hash_password(password: str) -> str:
     Returns:
         str: Hashed password
     """
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12)).decode('utf-8')
+    with _kdf_slots:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=config.BCRYPT_ROUNDS)).decode('utf-8')
+
+
+# Hash checked against when the user doesn't exist, to keep login timing uniform
+_DUMMY_HASH = bcrypt.hashpw(b"dummy-password", bcrypt.gensalt(rounds=config.BCRYPT_ROUNDS))
 
 
 def verify_password(password: str, password_hash: str) -> bool:
@@ -137,7 +241,8 @@ def verify_password(password: str, password_hash: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    with _kdf_slots:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
 
 
 def generate_secure_token() -> str:
@@ -150,6 +255,72 @@ def generate_secure_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+def hash_token(token: str) -> bytes:
+    """
+    Hash a token for storage and lookup.
+
+    Only the SHA-256 digest is stored, so a database leak does not expose
+    usable tokens.
+
+    Args:
+        token (str): URL-safe token
+
+    Returns:
+        bytes: 32-byte SHA-256 digest
+    """
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+# Shared SMTP connection, reused across emails and guarded by a lock
+_smtp_lock = threading.Lock()
+_smtp = None
+
+
+def _drop_smtp():
+    """
+    Close and forget the shared SMTP connection, so the next email reconnects.
+
+    Must be called with _smtp_lock held.
+    """
+    global _smtp
+
+    if _smtp is not None:
+        try:
+            _smtp.close()
+        except Exception:
+            pass
+        _smtp = None
+
+
+def _get_smtp() -> smtplib.SMTP:
+    """
+    Get the shared SMTP connection, reconnecting if it has gone stale.
+
+    Must be called with _smtp_lock held.
+
+    Returns:
+        smtplib.SMTP: Logged-in SMTP connection
+    """
+    global _smtp
+
+    if _smtp is not None:
+        try:
+            _smtp.noop()
+            return _smtp
+        except Exception:
+            _drop_smtp()
+
+    server = smtplib.SMTP(config.SMTP_HOST, config.SMTP_PORT)
+    try:
+        server.starttls()
+        server.login(config.SMTP_USERNAME, config.SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    _smtp = server
+    return _smtp
+
+
 def send_email(to_email: str, subject: str, html_body: str) -> bool:
     """
     Send an email using SMTP.
@@ -175,11 +346,13 @@ def send_email(to_email: str, subject: str, html_body: str) -> bool:
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
 
-        # Send email
-        with smtplib.SMTP(config.SMTP_HOST, config.SMTP_PORT) as server:
-            server.starttls()
-            server.login(config.SMTP_USERNAME, config.SMTP_PASSWORD)
-            server.send_message(msg)
+        # Send email over the shared connection
+        with _smtp_lock:
+            try:
+                _get_smtp().send_message(msg)
+            except Exception:
+                _drop_smtp()
+                raise
 
         return True
     except Exception as e:
@@ -187,6 +360,39 @@ def send_email(to_email: str, subject: str, html_body: str) -> bool:
         return False
 
 
+# Background email delivery, so callers don't wait on SMTP
+_mail_queue = queue.Queue()
+
+
+def _mail_worker():
+    """
+    Send queued emails one at a time for the lifetime of the process.
+    """
+    while True:
+        to_email, subject, html_body = _mail_queue.get()
+        try:
+            send_email(to_email, subject, html_body)
+        except Exception as e:
+            print(f"Error in mail worker: {str(e)}")
+        finally:
+            _mail_queue.task_done()
+
+
+def queue_email(to_email: str, subject: str, html_body: str):
+    """
+    Queue an email to be sent by the background mail worker.
+
+    Args:
+        to_email (str): Recipient email address
+        subject (str): Email subject
+        html_body (str): HTML email body
+    """
+    _mail_queue.put((to_email, subject, html_body))
+
+
+threading.Thread(target=_mail_worker, name="mail-worker", daemon=True).start()
+
+
 def register_user(email: str) -> Tuple[int, str]:
     """
     Register a new user and send verification email.
@@ -204,59 +410,58 @@ def register_user(email: str) -> Tuple[int, str]:
     if not validate_email_format(email):
         raise AuthError("Invalid email format")
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
-        # Check if user already exists
-        cursor.execute("SELECT id FROM users WHERE email = ?", (email.lower(),))
-        existing_user = cursor.fetchone()
+        try:
+            # Create user (without password yet); no row comes back if the
+            # email is already registered
+            cursor.execute("""
+                INSERT INTO users (email, is_verified)
+                VALUES (?, 0)
+                ON CONFLICT(email) DO NOTHING
+                RETURNING id
+            """, (email.lower(),))
 
-        if existing_user:
-            raise AuthError("User with this email already exists")
+            created_user = cursor.fetchone()
 
-        # Create user (without password yet)
-        cursor.execute("""
-            INSERT INTO users (email, is_verified)
-            VALUES (?, 0)
-        """, (email.lower(),))
+            if not created_user:
+                raise AuthError("User with this email already exists")
 
-        user_id = cursor.lastrowid
+            user_id = created_user[0]
 
-        # Generate verification token
-        token = generate_secure_token()
-        expires_at = datetime.now() + timedelta(hours=config.VERIFICATION_TOKEN_EXPIRY_HOURS)
+            # Generate verification token
+            token = generate_secure_token()
+            expires_at = datetime.now() + timedelta(hours=config.VERIFICATION_TOKEN_EXPIRY_HOURS)
 
-        cursor.execute("""
-            INSERT INTO email_verification_tokens (user_id, token, expires_at)
-            VALUES (?, ?, ?)
-        """, (user_id, token, expires_at))
+            cursor.execute("""
+                INSERT INTO email_verification_tokens (user_id, token, expires_at)
+                VALUES (?, ?, ?)
+            """, (user_id, hash_token(token), expires_at))
 
-        conn.commit()
+            conn.commit()
 
-        # Send verification email
-        encoded_token = quote(token, safe='')
-        verification_url = f"{config.APP_BASE_URL}/verify_email?token={encoded_token}"
-        email_body = get_verification_email_template(verification_url)
-        send_email(email, "Verify Your Email - Multi-Agent Stock Analyst", email_body)
+            # Send verification email
+            encoded_token = quote(token, safe='')
+            verification_url = f"{config.APP_BASE_URL}/verify_email?token={encoded_token}"
+            email_body = get_verification_email_template(verification_url)
+            queue_email(email, "Verify Your Email - Multi-Agent Stock Analyst", email_body)
 
-        # Send admin notification
-        admin_body = get_admin_notification_template(email)
-        send_email(config.ADMIN_EMAIL, f"New User Registration: {email}", admin_body)
+            # Send admin notification
+            admin_body = get_admin_notification_template(email)
+            queue_email(config.ADMIN_EMAIL, f"New User Registration: {email}", admin_body)
 
-        return user_id, token
+            return user_id, token
 
-    except sqlite3.IntegrityError:
-        conn.rollback()
-        raise AuthError("User with this email already exists")
-    except AuthError:
-        conn.rollback()
-        raise
-    except Exception as e:
-        conn.rollback()
-        raise AuthError(f"Error creating user: {str(e)}")
-    finally:
-        conn.close()
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            raise AuthError("User with this email already exists")
+        except AuthError:
+            conn.rollback()
+            raise
+        except Exception as e:
+            conn.rollback()
+            raise AuthError(f"Error creating user: {str(e)}")
 
 
 def verify_email_token(token: str) -> Optional[int]:
@@ -272,87 +477,145 @@ def verify_email_token(token: str) -> Optional[int]:
     if not token or not token.strip():
         return None
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    return verify_email_token_digest(hash_token(token.strip()))
 
-    try:
-        cursor.execute("""
-            SELECT user_id, expires_at, used_at
-            FROM email_verification_tokens
-            WHERE token = ?
-        """, (token.strip(),))
 
-        result = cursor.fetchone()
+# Verification lookups are batched: the worker takes every digest already
+# queued (up to _VERIFY_BATCH_MAX) and resolves them with one query, so a
+# burst of link clicks (e.g. after an email blast) costs one round trip per
+# batch instead of one per click, while a lone request doesn't wait at all
+_VERIFY_BATCH_MAX = 64
+_VERIFY_TIMEOUT = 10
+_verify_queue = queue.Queue()
 
-        if not result:
-            return None
 
-        user_id, expires_at_str, used_at = result
+def _lookup_email_tokens(digests: list) -> Dict[bytes, int]:
+    """
+    Look up the users for a batch of email verification token digests.
 
-        # Check if token already used
-        if used_at:
-            return None
+    Args:
+        digests (list): Distinct token digests from hash_token
 
-        # Parse expires_at - handle both string and datetime objects
-        if isinstance(expires_at_str, str):
-            expires_at = datetime.fromisoformat(expires_at_str)
-        else:
-            expires_at = expires_at_str
+    Returns:
+        Dict[bytes, int]: User ID by digest, for valid tokens only
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-        # Check if token is expired
-        if datetime.now() > expires_at:
-            return None
+        # Unused and unexpired tokens only; expires_at is stored in the same
+        # local-time format as the bound datetime, so they compare directly
+        cursor.execute(f"""
+            SELECT token, user_id
+            FROM email_verification_tokens
+            WHERE token IN ({",".join("?" * len(digests))})
+              AND used_at IS NULL AND expires_at > ?
+        """, (*digests, datetime.now()))
+
+        return {bytes(token): user_id for token, user_id in cursor.fetchall()}
 
-        return user_id
 
+def _verify_worker():
+    """
+    Resolve queued token verifications in batches for the lifetime of the process.
+    """
+    while True:
+        batch = [_verify_queue.get()]
+        try:
+            # Requests that arrived while the previous batch ran
+            while len(batch) < _VERIFY_BATCH_MAX:
+                try:
+                    batch.append(_verify_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            found = _lookup_email_tokens(list({digest for digest, _ in batch}))
+            for digest, future in batch:
+                future.set_result(found.get(digest))
+        except Exception as e:
+            # Reported by the waiting callers; the worker keeps running
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+threading.Thread(target=_verify_worker, name="verify-worker", daemon=True).start()
+
+
+def verify_email_token_digest(digest: bytes) -> Optional[int]:
+    """
+    Verify an email verification token by its SHA-256 digest.
+
+    The lookup is an exact match on the fixed-length digest, so its timing
+    reveals nothing about the raw token. Concurrent calls are batched into
+    a single query by the verify worker.
+
+    Args:
+        digest (bytes): Token digest from hash_token
+
+    Returns:
+        Optional[int]: User ID if token is valid, None otherwise
+    """
+    future = Future()
+    _verify_queue.put((digest, future))
+    try:
+        return future.result(timeout=_VERIFY_TIMEOUT)
     except Exception as e:
-        print(f"Error verifying token: {str(e)}")
+        print(f"Error verifying token: {str(e) or type(e).__name__}")
         return None
-    finally:
-        conn.close()
 
 
-def set_password(user_id: int, password: str) -> bool:
+def complete_verification(user_id: int, password: str) -> str:
     """
-    Set password for a user and mark as verified.
+    Set password for a user, mark them as verified, and use up their
+    verification token, in one transaction.
 
     Args:
         user_id (int): User ID
         password (str): Plain text password
 
     Returns:
-        bool: True if successful, False otherwise
+        str: The user's email, read back by the same UPDATE
     """
     if len(password) < 8:
         raise AuthError("Password must be at least 8 characters long")
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    # Hashed before taking a connection, which is held only for the updates
+    password_hash = hash_password(password)
 
-    try:
-        password_hash = hash_password(password)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-        cursor.execute("""
-            UPDATE users
-            SET password_hash = ?, is_verified = 1, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (password_hash, user_id))
+        try:
+            # Take the write lock up front so both updates commit together
+            cursor.execute("BEGIN IMMEDIATE")
 
-        # Mark verification token as used
-        cursor.execute("""
-            UPDATE email_verification_tokens
-            SET used_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND used_at IS NULL
-        """, (user_id,))
+            cursor.execute("""
+                UPDATE users
+                SET password_hash = ?, is_verified = 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                RETURNING email
+            """, (password_hash, user_id))
+            result = cursor.fetchone()
 
-        conn.commit()
-        return True
+            if not result:
+                raise AuthError("User not found")
 
-    except Exception as e:
-        conn.rollback()
-        raise AuthError(f"Error setting password: {str(e)}")
-    finally:
-        conn.close()
+            # Mark verification token as used
+            cursor.execute("""
+                UPDATE email_verification_tokens
+                SET used_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND used_at IS NULL
+            """, (user_id,))
+
+            conn.commit()
+            return result[0]
+
+        except AuthError:
+            conn.rollback()
+            raise
+        except Exception as e:
+            conn.rollback()
+            raise AuthError(f"Error setting password: {str(e)}")
 
 
 def authenticate(email: str, password: str) -> Optional[Dict]:
@@ -366,10 +629,9 @@ def authenticate(email: str, password: str) -> Optional[Dict]:
     Returns:
         Optional[Dict]: User data if authenticated, None otherwise
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
         cursor.execute("""
             SELECT id, email, password_hash, is_verified
             FROM users
@@ -378,31 +640,32 @@ def authenticate(email: str, password: str) -> Optional[Dict]:
 
         user = cursor.fetchone()
 
-        if not user:
-            return None
-
-        user_id, user_email, password_hash, is_verified = user
+    if not user:
+        # Spend the same bcrypt time as a real check so response timing
+        # doesn't reveal whether the email is registered
+        with _kdf_slots:
+            bcrypt.checkpw(password.encode('utf-8'), _DUMMY_HASH)
+        return None
 
-        # Check if user is verified
-        if not is_verified:
-            raise AuthError("Email not verified. Please verify your email first.")
+    user_id, user_email, password_hash, is_verified = user
 
-        # Check if password is set
-        if not password_hash:
-            raise AuthError("Password not set. Please complete registration.")
+    # Check if user is verified
+    if not is_verified:
+        raise AuthError("Email not verified. Please verify your email first.")
 
-        # Verify password
-        if not verify_password(password, password_hash):
-            return None
+    # Check if password is set
+    if not password_hash:
+        raise AuthError("Password not set. Please complete registration.")
 
-        return {
-            'id': user_id,
-            'email': user_email,
-            'is_verified': bool(is_verified)
-        }
+    # Verify password
+    if not verify_password(password, password_hash):
+        return None
 
-    finally:
-        conn.close()
+    return {
+        'id': user_id,
+        'email': user_email,
+        'is_verified': bool(is_verified)
+    }
 
 
 def request_password_reset(email: str) -> Optional[str]:
@@ -415,42 +678,40 @@ def request_password_reset(email: str) -> Optional[str]:
     Returns:
         Optional[str]: Reset token if user exists, None otherwise
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
-        cursor.execute("SELECT id FROM users WHERE email = ?", (email.lower(),))
-        user = cursor.fetchone()
+        try:
+            cursor.execute("SELECT id FROM users WHERE email = ?", (email.lower(),))
+            user = cursor.fetchone()
 
-        if not user:
-            return None  # Don't reveal if user exists or not
+            if not user:
+                return None  # Don't reveal if user exists or not
 
-        user_id = user[0]
+            user_id = user[0]
 
-        # Generate reset token
-        token = generate_secure_token()
-        expires_at = datetime.now() + timedelta(hours=config.PASSWORD_RESET_TOKEN_EXPIRY_HOURS)
+            # Generate reset token
+            token = generate_secure_token()
+            expires_at = datetime.now() + timedelta(hours=config.PASSWORD_RESET_TOKEN_EXPIRY_HOURS)
 
-        cursor.execute("""
-            INSERT INTO password_reset_tokens (user_id, token, expires_at)
-            VALUES (?, ?, ?)
-        """, (user_id, token, expires_at))
+            cursor.execute("""
+                INSERT INTO password_reset_tokens (user_id, token, expires_at)
+                VALUES (?, ?, ?)
+            """, (user_id, hash_token(token), expires_at))
 
-        conn.commit()
+            conn.commit()
 
-        # Send reset email
-        encoded_token = quote(token, safe='')
-        reset_url = f"{config.APP_BASE_URL}/reset_password?token={encoded_token}"
-        email_body = get_password_reset_email_template(reset_url)
-        send_email(email, "Reset Your Password - Multi-Agent Stock Analyst", email_body)
+            # Send reset email
+            encoded_token = quote(token, safe='')
+            reset_url = f"{config.APP_BASE_URL}/reset_password?token={encoded_token}"
+            email_body = get_password_reset_email_template(reset_url)
+            queue_email(email, "Reset Your Password - Multi-Agent Stock Analyst", email_body)
 
-        return token
+            return token
 
-    except Exception as e:
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
+        except Exception as e:
+            conn.rollback()
+            return None
 
 
 def verify_reset_token(token: str) -> Optional[int]:
@@ -466,45 +727,26 @@ def verify_reset_token(token: str) -> Optional[int]:
     if not token or not token.strip():
         return None
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
-        cursor.execute("""
-            SELECT user_id, expires_at, used_at
-            FROM password_reset_tokens
-            WHERE token = ?
-        """, (token.strip(),))
+        try:
+            # Unused and unexpired tokens only; expires_at is stored in the same
+            # local-time format as the bound datetime, so they compare directly
+            cursor.execute("""
+                SELECT user_id
+                FROM password_reset_tokens
+                WHERE token = ? AND used_at IS NULL AND expires_at > ?
+            """, (hash_token(token.strip()), datetime.now()))
 
-        result = cursor.fetchone()
+            result = cursor.fetchone()
 
-        if not result:
-            return None
-
-        user_id, expires_at_str, used_at = result
-
-        # Check if token already used
-        if used_at:
-            return None
-
-        # Parse expires_at - handle both string and datetime objects
-        if isinstance(expires_at_str, str):
-            expires_at = datetime.fromisoformat(expires_at_str)
-        else:
-            expires_at = expires_at_str
+            return result[0] if result else None
 
-        # Check if token is expired
-        if datetime.now() > expires_at:
+        except Exception as e:
+            print(f"Error verifying reset token: {str(e)}")
             return None
 
-        return user_id
-
-    except Exception as e:
-        print(f"Error verifying reset token: {str(e)}")
-        return None
-    finally:
-        conn.close()
-
 
 def reset_password(user_id: int, new_password: str) -> bool:
     """
@@ -520,33 +762,35 @@ def reset_password(user_id: int, new_password: str) -> bool:
     if len(new_password) < 8:
         raise AuthError("Password must be at least 8 characters long")
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    # Hashed before taking a connection, which is held only for the updates
+    password_hash = hash_password(new_password)
 
-    try:
-        password_hash = hash_password(new_password)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-        cursor.execute("""
-            UPDATE users
-            SET password_hash = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (password_hash, user_id))
+        try:
+            # Take the write lock up front so both updates commit together
+            cursor.execute("BEGIN IMMEDIATE")
 
-        # Mark reset token as used
-        cursor.execute("""
-            UPDATE password_reset_tokens
-            SET used_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND used_at IS NULL
-        """, (user_id,))
+            cursor.execute("""
+                UPDATE users
+                SET password_hash = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (password_hash, user_id))
 
-        conn.commit()
-        return True
+            # Mark reset token as used
+            cursor.execute("""
+                UPDATE password_reset_tokens
+                SET used_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND used_at IS NULL
+            """, (user_id,))
 
-    except Exception as e:
-        conn.rollback()
-        raise AuthError(f"Error resetting password: {str(e)}")
-    finally:
-        conn.close()
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            raise AuthError(f"Error resetting password: {str(e)}")
 
 
 def get_user_by_id(user_id: int) -> Optional[Dict]:
@@ -559,10 +803,9 @@ def get_user_by_id(user_id: int) -> Optional[Dict]:
     Returns:
         Optional[Dict]: User data if found, None otherwise
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
         cursor.execute("""
             SELECT id, email, is_verified
             FROM users
@@ -580,9 +823,6 @@ def get_user_by_id(user_id: int) -> Optional[Dict]:
             'is_verified': bool(user[2])
         }
 
-    finally:
-        conn.close()
-
 
 # Initialize database on import
 init_database()
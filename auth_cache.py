@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Cached authentication lookups for the Streamlit pages.
+
+Streamlit reruns a page on every interaction; these wrappers keep repeated
+reruns from hitting the database for the same token or user.
+"""
+
+import time
+from functools import lru_cache
+from typing import Optional, Dict
+
+import streamlit as st
+
+import auth
+
+
+def cached_verify_reset_token(token: str) -> Optional[int]:
+    """
+    Cached wrapper around auth.verify_reset_token.
+
+    Results are reused for up to a minute. Call clear_reset_token_cache()
+    once a token has been used, so the consumed token is not served from
+    the cache.
+
+    Args:
+        token (str): Reset token
+
+    Returns:
+        Optional[int]: User ID if token is valid, None otherwise
+    """
+    return _verify_reset_token_cached(token, int(time.time() // 60))
+
+
+@lru_cache(maxsize=256)
+def _verify_reset_token_cached(token: str, minute_bucket: int) -> Optional[int]:
+    """
+    Verify a reset token, cached per token for the current minute.
+    """
+    return auth.verify_reset_token(token)
+
+
+def clear_reset_token_cache():
+    """Drop all cached reset token verifications."""
+    _verify_reset_token_cached.cache_clear()
+
+
+@st.cache_data(ttl=60, max_entries=1024, show_spinner=False)
+def cached_get_user_by_id(user_id: int) -> Optional[Dict]:
+    """
+    Cached wrapper around auth.get_user_by_id.
+
+    Args:
+        user_id (int): User ID
+
+    Returns:
+        Optional[Dict]: User data or None if not found
+    """
+    return auth.get_user_by_id(user_id)
@@ -32,6 +32,13 @@ APP_URL = APP_BASE_URL  # Keep for backward compatibility
 VERIFICATION_TOKEN_EXPIRY_HOURS = 24
 PASSWORD_RESET_TOKEN_EXPIRY_HOURS = 1
 
+# Bcrypt work factor for password hashing (tune to target hardware)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Maximum concurrent bcrypt hashes; set to the container's CPU limit (e.g.
+# the Cloud Run vCPU count). 0 uses the CPUs this process may run on.
+BCRYPT_CONCURRENCY = int(os.getenv("BCRYPT_CONCURRENCY", "0"))
+
 # Database file
 DATABASE_FILE = "auth.db"
 
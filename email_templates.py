@@ -2,26 +2,32 @@
 # coding: utf-8
 """
 Email templates for authentication system.
+
+Templates are assembled once at import from shared HTML/CSS constants and
+split into static chunks around their placeholders, which are minified; each
+email is built with a single str.join. Interpolated values are HTML-escaped.
 """
 
+import html
+import re
+import string
+import time
 
-def get_verification_email_template(verification_url: str) -> str:
-    """
-    Get HTML template for email verification.
-    
-    Args:
-        verification_url (str): URL with verification token
-    
-    Returns:
-        str: HTML email template
-    """
-    return f"""
+
+# Registration time format for the admin notification
+_TS_FMT = '%Y-%m-%d %H:%M:%S'
+
+
+# Shared page layout (literal CSS braces are doubled for format-string syntax)
+_HTML_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
         <meta charset="UTF-8">
         <style>
-            body {{
+"""
+
+_BASE_CSS = """            body {{
                 font-family: Arial, sans-serif;
                 line-height: 1.6;
                 color: #333;
@@ -40,113 +46,139 @@ def get_verification_email_template(verification_url: str) -> str:
                 color: #2c3e50;
                 margin-bottom: 30px;
             }}
-            .button {{
-                display: inline-block;
-                padding: 12px 30px;
-                background-color: #4CAF50;
-                color: white;
-                text-decoration: none;
-                border-radius: 5px;
-                margin: 20px 0;
-            }}
             .footer {{
                 margin-top: 30px;
                 font-size: 12px;
                 color: #777;
                 text-align: center;
             }}
-        </style>
+"""
+
+_HTML_BODY_OPEN = """        </style>
     </head>
     <body>
         <div class="container">
-            <h1 class="header">Verify Your Email Address</h1>
-            <p>Thank you for signing up for Multi-Agent Stock Analyst!</p>
-            <p>Please click the button below to verify your email address and complete your registration:</p>
-            <div style="text-align: center;">
-                <a href="{verification_url}" class="button">Verify Email</a>
-            </div>
-            <p>Or copy and paste this link into your browser:</p>
-            <p style="word-break: break-all; color: #666;">{verification_url}</p>
-            <p><strong>This link will expire in 24 hours.</strong></p>
-            <div class="footer">
-                <p>If you did not sign up for this account, please ignore this email.</p>
-                <p>© Multi-Agent Stock Analyst</p>
-            </div>
-        </div>
+"""
+
+_HTML_TAIL = """        </div>
     </body>
     </html>
     """
 
 
-def get_password_reset_email_template(reset_url: str) -> str:
+def _button_css(color: str) -> str:
     """
-    Get HTML template for password reset.
-    
+    Get the call-to-action button CSS in the given background color.
+
     Args:
-        reset_url (str): URL with reset token
-    
+        color (str): CSS background color
+
     Returns:
-        str: HTML email template
+        str: CSS rule block
     """
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .container {{
-                background-color: #f9f9f9;
-                padding: 30px;
-                border-radius: 10px;
-                border: 1px solid #ddd;
-            }}
-            .header {{
-                text-align: center;
-                color: #2c3e50;
-                margin-bottom: 30px;
-            }}
-            .button {{
+    return """            .button {{
                 display: inline-block;
                 padding: 12px 30px;
-                background-color: #e74c3c;
+                background-color: """ + color + """;
                 color: white;
                 text-decoration: none;
                 border-radius: 5px;
                 margin: 20px 0;
             }}
-            .footer {{
-                margin-top: 30px;
-                font-size: 12px;
-                color: #777;
-                text-align: center;
-            }}
-            .warning {{
+"""
+
+
+def _build_template(extra_css: str, content: str) -> str:
+    """
+    Assemble a complete email template from the shared layout.
+
+    Args:
+        extra_css (str): Template-specific CSS rules
+        content (str): HTML inside the container div
+
+    Returns:
+        str: Template with {placeholder} fields
+    """
+    return _HTML_HEAD + _BASE_CSS + extra_css + _HTML_BODY_OPEN + content + _HTML_TAIL
+
+
+def _minify(chunk: str) -> str:
+    """
+    Collapse runs of whitespace in a static HTML chunk.
+
+    Whitespace between tags is dropped and any other run becomes one space,
+    which renders the same in HTML.
+
+    Args:
+        chunk (str): Static HTML text
+
+    Returns:
+        str: Minified HTML text
+    """
+    return re.sub(r">\s+<", "><", re.sub(r"\s+", " ", chunk))
+
+
+def _split_template(template: str) -> tuple:
+    """
+    Split a template into the static chunks between its placeholders.
+
+    Args:
+        template (str): Template with {placeholder} fields
+
+    Returns:
+        tuple: Minified literal chunks (with doubled braces collapsed), one
+            more than the number of placeholders
+    """
+    chunks = []
+    current = []
+    for literal, field_name, _, _ in string.Formatter().parse(template):
+        current.append(literal)
+        if field_name is not None:
+            chunks.append("".join(current))
+            current = []
+    chunks.append("".join(current))
+    chunks[0] = chunks[0].lstrip()
+    chunks[-1] = chunks[-1].rstrip()
+    return tuple(_minify(chunk) for chunk in chunks)
+
+
+# Verification email; placeholders: url
+_VERIFICATION_TPL = _build_template(
+    _button_css("#4CAF50"),
+    """            <h1 class="header">Verify Your Email Address</h1>
+            <p>Thank you for signing up for Multi-Agent Stock Analyst!</p>
+            <p>Please click the button below to verify your email address and complete your registration:</p>
+            <div style="text-align: center;">
+                <a href="{url}" class="button">Verify Email</a>
+            </div>
+            <p>Or copy and paste this link into your browser:</p>
+            <p style="word-break: break-all; color: #666;">{url}</p>
+            <p><strong>This link will expire in 24 hours.</strong></p>
+            <div class="footer">
+                <p>If you did not sign up for this account, please ignore this email.</p>
+                <p>© Multi-Agent Stock Analyst</p>
+            </div>
+"""
+)
+
+# Password reset email; placeholders: url
+_PASSWORD_RESET_TPL = _build_template(
+    _button_css("#e74c3c") + """            .warning {{
                 background-color: #fff3cd;
                 padding: 15px;
                 border-radius: 5px;
                 border-left: 4px solid #ffc107;
                 margin: 20px 0;
             }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1 class="header">Reset Your Password</h1>
+""",
+    """            <h1 class="header">Reset Your Password</h1>
             <p>We received a request to reset your password for your Multi-Agent Stock Analyst account.</p>
             <p>Click the button below to reset your password:</p>
             <div style="text-align: center;">
-                <a href="{reset_url}" class="button">Reset Password</a>
+                <a href="{url}" class="button">Reset Password</a>
             </div>
             <p>Or copy and paste this link into your browser:</p>
-            <p style="word-break: break-all; color: #666;">{reset_url}</p>
+            <p style="word-break: break-all; color: #666;">{url}</p>
             <div class="warning">
                 <p><strong>Important:</strong> This link will expire in 1 hour.</p>
                 <p>If you did not request a password reset, please ignore this email. Your password will remain unchanged.</p>
@@ -154,77 +186,78 @@ def get_password_reset_email_template(reset_url: str) -> str:
             <div class="footer">
                 <p>© Multi-Agent Stock Analyst</p>
             </div>
-        </div>
-    </body>
-    </html>
-    """
-
+"""
+)
 
-def get_admin_notification_template(user_email: str) -> str:
-    """
-    Get HTML template for admin notification email.
-    
-    Args:
-        user_email (str): Email of the newly registered user
-    
-    Returns:
-        str: HTML email template
-    """
-    from datetime import datetime
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .container {{
-                background-color: #f9f9f9;
-                padding: 30px;
-                border-radius: 10px;
-                border: 1px solid #ddd;
-            }}
-            .header {{
-                text-align: center;
-                color: #2c3e50;
-                margin-bottom: 30px;
-            }}
-            .info-box {{
+# Admin notification email; placeholders: user_email, timestamp
+_ADMIN_NOTIFICATION_TPL = _build_template(
+    """            .info-box {{
                 background-color: #e8f4f8;
                 padding: 15px;
                 border-radius: 5px;
                 border-left: 4px solid #3498db;
                 margin: 20px 0;
             }}
-            .footer {{
-                margin-top: 30px;
-                font-size: 12px;
-                color: #777;
-                text-align: center;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1 class="header">New User Registration</h1>
+""",
+    """            <h1 class="header">New User Registration</h1>
             <p>A new user has registered for Multi-Agent Stock Analyst.</p>
             <div class="info-box">
                 <p><strong>User Email:</strong> {user_email}</p>
-                <p><strong>Registration Time:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                <p><strong>Registration Time:</strong> {timestamp}</p>
             </div>
             <p>Please review the user registration in the admin panel.</p>
             <div class="footer">
                 <p>© Multi-Agent Stock Analyst - Admin Notification</p>
             </div>
-        </div>
-    </body>
-    </html>
+"""
+)
+
+# Static chunks around each template's placeholders
+_VERIFY_HEAD, _VERIFY_MID, _VERIFY_TAIL = _split_template(_VERIFICATION_TPL)
+_RESET_HEAD, _RESET_MID, _RESET_TAIL = _split_template(_PASSWORD_RESET_TPL)
+_ADMIN_HEAD, _ADMIN_MID, _ADMIN_TAIL = _split_template(_ADMIN_NOTIFICATION_TPL)
+
+
+def get_verification_email_template(verification_url: str) -> str:
     """
+    Get HTML template for email verification.
 
+    Args:
+        verification_url (str): URL with verification token
+
+    Returns:
+        str: HTML email template
+    """
+    url = html.escape(verification_url)
+    return "".join((_VERIFY_HEAD, url, _VERIFY_MID, url, _VERIFY_TAIL))
+
+
+def get_password_reset_email_template(reset_url: str) -> str:
+    """
+    Get HTML template for password reset.
+
+    Args:
+        reset_url (str): URL with reset token
+
+    Returns:
+        str: HTML email template
+    """
+    url = html.escape(reset_url)
+    return "".join((_RESET_HEAD, url, _RESET_MID, url, _RESET_TAIL))
+
+
+def get_admin_notification_template(user_email: str) -> str:
+    """
+    Get HTML template for admin notification email.
+
+    Args:
+        user_email (str): Email of the newly registered user
+
+    Returns:
+        str: HTML email template
+    """
+    return "".join((
+        _ADMIN_HEAD, html.escape(user_email),
+        _ADMIN_MID, time.strftime(_TS_FMT),
+        _ADMIN_TAIL
+    ))
@@ -23,7 +23,18 @@ Requirements:
 
 import os
 import sys
+import asyncio
+import copy
+import hashlib
+import time
 import subprocess
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache, wraps
+from pathlib import Path
 
 # Auto-install yfinance if missing
 try:
@@ -36,14 +47,356 @@ else:
 
 import pandas as pd
 import numpy as np
+import joblib
 import google.generativeai as genai
+from google.generativeai import client as genai_client
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
+
+
+# App-owned directory for the disk caches (override with STOCK_CACHE_DIR).
+# Cached files are unpickled on load, so it must be private to this user.
+_CACHE_DIR = Path(os.getenv("STOCK_CACHE_DIR") or Path.home() / ".cache" / "multi-agent-stock-analyst")
+
+# Fitted ML models, cached on disk per ticker and day
+_MODEL_DIR = _CACHE_DIR / "models"
+_MODEL_TTL = 86400
+
+# Raw Yahoo Finance responses, cached on disk between runs (TTLs in seconds)
+_DATA_DIR = _CACHE_DIR / "data"
+_HISTORY_TTL = 300
+_INFO_TTL = 86400
+
+# The only .info fields the fundamental agent reads
+_INFO_FIELDS = ("trailingPE", "marketCap", "recommendationKey")
+
+# Result keys of the ML agent, in the order the values are built
+_ML_KEYS = tuple(map(sys.intern, (
+    "current_price", "ml_predicted_price", "predicted_direction",
+    "expected_change_pct", "model_used"
+)))
 
 
 # ============================================================================
 # AGENT FUNCTIONS
 # ============================================================================
+# Agent results are cached per ticker in coarse time buckets, so repeated
+# calls (e.g. from the AI agent and the UI) don't re-download data or retrain.
+# Failures are raised as AgentError inside the cached functions, so only
+# successful results are memoized, and turned into error dicts by the public
+# agent functions.
+
+
+class AgentError(Exception):
+    """Agent failure whose message is returned to the caller as the error."""
+
+
+def _normalize_ticker(ticker: str) -> str:
+    """
+    Normalize and intern a ticker symbol for use as a cache key.
+
+    Args:
+        ticker (str): Stock ticker symbol
+
+    Returns:
+        str: Upper-cased, stripped, interned ticker
+    """
+    return sys.intern(ticker.upper().strip())
+
+
+def _safe_filename(ticker: str) -> str:
+    """
+    Make a ticker symbol safe to use in a file name.
+
+    Args:
+        ticker (str): Normalized stock ticker symbol
+
+    Returns:
+        str: Ticker with unsafe characters replaced by '_'
+    """
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in ticker)
+
+
+def _private_dir(path: Path) -> bool:
+    """
+    Create a cache directory private to this user, and check that it is.
+
+    Args:
+        path (Path): Cache directory
+
+    Returns:
+        bool: True if the directory exists, is owned by this user, and is
+            not accessible to anyone else
+    """
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.stat()
+    except OSError as e:
+        print(f"⚠️ Could not create cache directory {path}: {str(e)}")
+        return False
+
+    if (hasattr(os, "getuid") and st.st_uid != os.getuid()) or st.st_mode & 0o077:
+        print(f"⚠️ Not using cache directory {path}: it is not private to this user")
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def _prune_disk_cache(hour_bucket: int):
+    """
+    Delete expired files from the disk caches, at most once per hour.
+
+    Args:
+        hour_bucket (int): Current hour, used to run once per hour
+    """
+    now = time.time()
+    for directory, max_age in ((_MODEL_DIR, _MODEL_TTL), (_DATA_DIR, _INFO_TTL)):
+        try:
+            paths = list(directory.iterdir())
+        except OSError:
+            continue
+        for path in paths:
+            try:
+                if now - path.stat().st_mtime > max_age:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+def _atomic_dump(value, path: Path, **kwargs):
+    """
+    Save an object with joblib through a uniquely named temp file.
+
+    The temp file is renamed into place once complete, so readers never see
+    a partial file, and each writer has its own, so concurrent writers (in
+    any thread or process) can't truncate each other's output.
+
+    Args:
+        value: Object to save
+        path (Path): Destination file
+        **kwargs: Passed to joblib.dump (e.g. compress)
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        joblib.dump(value, tmp_name, **kwargs)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _disk_cached(path: Path, ttl: int, fetch):
+    """
+    Return the object cached at path if younger than ttl, else fetch and save.
+
+    Args:
+        path (Path): Cache file location
+        ttl (int): Maximum age of the cached file in seconds
+        fetch (callable): Zero-argument function producing the value
+
+    Returns:
+        The cached or freshly fetched value (None results are not cached)
+    """
+    if not _private_dir(path.parent):
+        return fetch()
+
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return joblib.load(path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Could not load cached data {path.name}: {str(e)}")
+
+    value = fetch()
+    if value is None:
+        return value
+
+    try:
+        _atomic_dump(value, path)
+    except Exception as e:
+        print(f"⚠️ Could not cache data {path.name}: {str(e)}")
+    _prune_disk_cache(int(time.time() // 3600))
+
+    return value
+
+
+def _single_flight(func):
+    """
+    Decorator: concurrent calls with the same arguments share one execution.
+
+    lru_cache doesn't merge concurrent misses, so agents started together
+    (e.g. the UI's parallel agent calls) would each fetch or train. Placed
+    under lru_cache, the first caller runs func and the others wait for its
+    result (or exception) instead.
+
+    Args:
+        func (callable): Function with hashable positional arguments
+
+    Returns:
+        callable: Wrapped function
+    """
+    in_flight = {}
+    lock = threading.Lock()
+
+    @wraps(func)
+    def wrapper(*args):
+        with lock:
+            future = in_flight.get(args)
+            owner = future is None
+            if owner:
+                future = in_flight[args] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with lock:
+                del in_flight[args]
+
+    return wrapper
+
+
+# Market data shared by all agents for one ticker
+MarketDataBundle = namedtuple("MarketDataBundle", ["history", "info"])
+
+
+@lru_cache(maxsize=64)
+@_single_flight
+def _get_bundle(ticker: str, minute_bucket: int) -> MarketDataBundle:
+    """
+    Fetch 1y price history and fundamentals info for a ticker in parallel.
+
+    All agents read from this one fetch, cached per ticker for the current
+    minute (concurrent first calls wait on a single fetch), instead of each
+    issuing its own Yahoo Finance requests. The raw
+    responses are also cached on disk (history for 5 minutes, info for a
+    day), so restarts and other processes skip the network round trip.
+
+    Args:
+        ticker (str): Normalized stock ticker symbol
+        minute_bucket (int): Current minute, used to expire the cache
+
+    Returns:
+        MarketDataBundle: history (DataFrame) and info (dict of _INFO_FIELDS,
+            or None if the info request failed)
+    """
+    stock = yf.Ticker(ticker)
+    safe_ticker = _safe_filename(ticker)
+
+    def fetch_history():
+        # Empty frames (unknown symbols) are not worth caching
+        history = stock.history(period="1y")
+        return None if history.empty else history
+
+    def fetch_info():
+        # Keep just the fields used, not the whole quoteSummary payload
+        try:
+            info = stock.info
+        except Exception:
+            return None
+        fields = {key: info[key] for key in _INFO_FIELDS if key in info}
+        # fast_info derives market cap from price and share count
+        if "marketCap" not in fields:
+            try:
+                fields["marketCap"] = stock.fast_info.market_cap
+            except Exception:
+                pass
+        return fields
+
+    def cached_history():
+        history = _disk_cached(_DATA_DIR / f"{safe_ticker}_history.joblib", _HISTORY_TTL, fetch_history)
+        return pd.DataFrame() if history is None else history
+
+    def cached_info():
+        return _disk_cached(_DATA_DIR / f"{safe_ticker}_fundamentals.joblib", _INFO_TTL, fetch_info)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        f_history = executor.submit(cached_history)
+        f_info = executor.submit(cached_info)
+        return MarketDataBundle(f_history.result(), f_info.result())
+
+
+def _sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple moving average using cumulative sums, in O(n).
+
+    Like pandas rolling(window).mean(), a NaN input only affects the windows
+    that contain it, instead of propagating through the cumulative sum.
+
+    Args:
+        values (np.ndarray): 1-D float64 array
+        window (int): Averaging window length
+
+    Returns:
+        np.ndarray: Array of the same length as values, NaN where the window
+            has fewer than `window` valid values
+    """
+    cs = np.zeros(len(values) + 1)
+    np.nancumsum(values, out=cs[1:])
+    valid = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(~np.isnan(values), out=valid[1:])
+    sma = np.full(len(values), np.nan)
+    if len(values) >= window:
+        full = (valid[window:] - valid[:-window]) == window
+        sma[window - 1:] = np.where(full, (cs[window:] - cs[:-window]) / window, np.nan)
+    return sma
+
+
+def _load_or_train_model(ticker: str, X_train: np.ndarray, y_train: np.ndarray) -> RandomForestRegressor:
+    """
+    Load today's fitted model for a ticker from disk, or train and save one.
+
+    Daily price history only changes once per trading day, so a model fitted
+    earlier the same day is reused instead of refitting the forest.
+
+    Args:
+        ticker (str): Normalized stock ticker symbol
+        X_train (np.ndarray): Training features
+        y_train (np.ndarray): Training targets
+
+    Returns:
+        RandomForestRegressor: Fitted model
+    """
+    path = _MODEL_DIR / f"{_safe_filename(ticker)}_{date.today().isoformat()}.joblib"
+    use_cache = _private_dir(_MODEL_DIR)
+
+    if use_cache and path.exists():
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            print(f"⚠️ Could not load cached model for {ticker}: {str(e)}")
+
+    # Trees built in parallel, depth capped to bound cost
+    model = RandomForestRegressor(
+        n_estimators=50,
+        max_depth=12,
+        max_features='sqrt',
+        n_jobs=-1,
+        random_state=42
+    )
+    model.fit(X_train, y_train)
+    if not use_cache:
+        return model
+
+    try:
+        _atomic_dump(model, path, compress=3)
+    except Exception as e:
+        print(f"⚠️ Could not cache model for {ticker}: {str(e)}")
+    _prune_disk_cache(int(time.time() // 3600))
+
+    return model
+
 
 def get_ml_prediction(ticker: str) -> dict:
     """
@@ -68,63 +421,79 @@ def get_ml_prediction(ticker: str) -> dict:
     Raises:
         Exception: Handled internally, returns error dict instead
     """
+    ticker = _normalize_ticker(ticker)
+    try:
+        return copy.copy(_ml_prediction_cached(ticker, int(time.time() // 60)))
+    except AgentError as e:
+        return {"error": str(e)}
+
+
+@lru_cache(maxsize=256)
+@_single_flight
+def _ml_prediction_cached(ticker: str, minute_bucket: int) -> dict:
+    """
+    Compute the ML prediction, cached per ticker for the current minute.
+    """
     try:
         print(f"🤖 Quant Agent: Fetching data for {ticker}...")
         
         # Fetch Data (Increased period to ensure enough data for rolling averages)
-        stock = yf.Ticker(ticker)
-        df = stock.history(period="1y") 
+        # Copy, since feature columns are added to the shared cached frame
+        df = _get_bundle(ticker, minute_bucket).history.copy()
         
         # CHECK 1: Did we get data?
         if df.empty:
-            return {"error": "Symbol not found or no data returned from Yahoo Finance."}
+            raise AgentError("Symbol not found or no data returned from Yahoo Finance.")
 
-        # Feature Engineering
-        df['SMA_10'] = df['Close'].rolling(window=10).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        df['Target'] = df['Close'].shift(-1) # Target is tomorrow's price
+        # Feature Engineering (on the raw closes, avoiding pandas rolling)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        df['SMA_10'] = _sma(close, 10)
+        df['SMA_50'] = _sma(close, 50)
         
         # CHECK 2: Remove NaNs created by rolling windows
         df = df.dropna()
         
         # CHECK 3: Do we still have enough data to train?
-        if len(df) < 50:
-            return {"error": "Not enough historical data to train ML model (Stock might be too new)."}
+        if len(df) < 51:
+            raise AgentError("Not enough historical data to train ML model (Stock might be too new).")
 
         # Define Features (X) and Target (y)
         feature_cols = ['Open', 'High', 'Low', 'Close', 'Volume', 'SMA_10', 'SMA_50']
-        X = df[feature_cols]
-        y = df['Target']
+        # float32 halves memory traffic during split search
+        X = df[feature_cols].to_numpy(dtype=np.float32)
+        y = df['Close'].to_numpy(dtype=np.float32)
 
-        # Train/Test Split
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+        # Each day is trained against the next day's close, using all
+        # history; the last day has no known target and is held out
+        X_train, y_train = X[:-1], y[1:]
         
-        # Model Training
-        model = RandomForestRegressor(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        # Model Training (reuses today's model for this ticker if on disk)
+        model = _load_or_train_model(ticker, X_train, y_train)
         
         # Prediction for Tomorrow
         # We take the VERY LAST row of data to predict the NEXT unknown Close
-        latest_data = df.iloc[[-1]][feature_cols]
-        predicted_price = model.predict(latest_data)[0]
-        current_close = df.iloc[-1]['Close']
+        latest_data = X[-1:]
+        predicted_price = float(model.predict(latest_data)[0])
+        current_close = float(close[-1])
         
         direction = "UP 📈" if predicted_price > current_close else "DOWN 📉"
         pct_change = ((predicted_price - current_close) / current_close) * 100
 
         print(f"   >>> ML Success: Predicted {direction}")
 
-        return {
-            "current_price": round(current_close, 2),
-            "ml_predicted_price": round(predicted_price, 2),
-            "predicted_direction": direction,
-            "expected_change_pct": round(pct_change, 2),
-            "model_used": "RandomForestRegressor"
-        }
+        return dict(zip(_ML_KEYS, (
+            float(f"{current_close:.2f}"),
+            float(f"{predicted_price:.2f}"),
+            direction,
+            float(f"{pct_change:.2f}"),
+            "RandomForestRegressor"
+        )))
 
+    except AgentError:
+        raise
     except Exception as e:
         print(f"❌ ML CRASH DETECTED: {str(e)}")
-        return {"error": f"ML Analysis failed internally: {str(e)}"}
+        raise AgentError(f"ML Analysis failed internally: {str(e)}")
 
 
 def get_technical_analysis(ticker: str) -> dict:
@@ -147,24 +516,42 @@ def get_technical_analysis(ticker: str) -> dict:
     Raises:
         Exception: Handled internally, returns error dict instead
     """
+    ticker = _normalize_ticker(ticker)
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period="6mo")
-        if df.empty: return {"error": "No data"}
-
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        return copy.copy(_technical_analysis_cached(ticker, int(time.time() // 60)))
+    except AgentError as e:
+        return {"error": str(e)}
+
+
+@lru_cache(maxsize=256)
+def _technical_analysis_cached(ticker: str, minute_bucket: int) -> dict:
+    """
+    Compute the technical analysis, cached per ticker for the current minute.
+    """
+    try:
+        # Last ~6 months of trading days from the shared 1y history
+        df = _get_bundle(ticker, minute_bucket).history.iloc[-126:]
+        if df.empty: raise AgentError("No data")
+
+        close = df['Close'].to_numpy(dtype=np.float64)
+
+        # RSI (14-day average gain vs. average loss)
+        delta = np.diff(close)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        avg_gain = _sma(gain, 14)[-1]
+        avg_loss = _sma(loss, 14)[-1]
+        rs = avg_gain / max(avg_loss, 1e-12)
+        rsi = 100.0 - 100.0 / (1.0 + rs)
         
         return {
-            "RSI": round(rsi.iloc[-1], 2),
-            "Trend": "Bullish" if df['Close'].iloc[-1] > df['Close'].mean() else "Bearish"
+            "RSI": float(f"{rsi:.2f}"),
+            "Trend": "Bullish" if close[-1] > close.mean() else "Bearish"
         }
+    except AgentError:
+        raise
     except Exception as e:
-        return {"error": str(e)}
+        raise AgentError(str(e))
 
 
 def get_fundamental_health(ticker: str) -> dict:
@@ -188,21 +575,94 @@ def get_fundamental_health(ticker: str) -> dict:
     Raises:
         Exception: Handled internally, returns error dict instead
     """
+    ticker = _normalize_ticker(ticker)
+    try:
+        return copy.copy(_fundamental_health_cached(ticker, int(time.time() // 3600)))
+    except AgentError as e:
+        return {"error": str(e)}
+
+
+@lru_cache(maxsize=256)
+def _fundamental_health_cached(ticker: str, hour_bucket: int) -> dict:
+    """
+    Fetch the fundamental metrics, cached per ticker for the current hour.
+    """
     try:
-        info = yf.Ticker(ticker).info
+        info = _get_bundle(ticker, int(time.time() // 60)).info
+        if info is None:
+            raise AgentError("Could not fetch fundamentals")
         return {
             "PE_Ratio": info.get('trailingPE', 'N/A'),
             "Market_Cap": info.get('marketCap', 'N/A'),
             "Analyst_Rec": info.get('recommendationKey', 'none').upper()
         }
+    except AgentError:
+        raise
     except Exception:
-        return {"error": "Could not fetch fundamentals"}
+        raise AgentError("Could not fetch fundamentals")
 
 
 # ============================================================================
 # AI AGENT INITIALIZATION
 # ============================================================================
 
+_SYSTEM_INSTRUCTION = sys.intern("""
+        You are a Hedge Fund Manager.
+        1. ALWAYS run `get_ml_prediction` first.
+        2. If the ML tool returns an "error" field, tell the user "I couldn't run the ML model because [reason]".
+        3. Otherwise, combine ML, Technicals, and Fundamentals into a trading recommendation.
+        """)
+
+# GenerativeModel instances by API key digest (raw keys aren't kept), least
+# recently used first, evicted beyond _MAX_MODELS
+_MAX_MODELS = 32
+_MODELS = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def _get_model(api_key: str):
+    """
+    Get the GenerativeModel for an API key, building it on first use.
+
+    Building the model introspects the tool functions into JSON schemas, so
+    it is done once per key and shared by every chat started with that key.
+
+    The SDK's API key is process-wide: genai.configure sets it globally and
+    a model otherwise binds its client lazily, on first use, to whichever
+    key is configured at that moment. Each model is therefore bound to a
+    client for its own key as soon as it is built, under the lock, so a
+    shared model can never pick up another session's key.
+
+    Args:
+        api_key (str): Google Generative AI API key
+
+    Returns:
+        GenerativeModel: Model configured with the agent tools
+    """
+    key_digest = hashlib.sha256(api_key.encode('utf-8')).digest()
+    with _models_lock:
+        model = _MODELS.get(key_digest)
+        if model is None:
+            # Configure Google Generative AI with the provided API key
+            genai.configure(api_key=api_key)
+
+            tools = [get_ml_prediction, get_technical_analysis, get_fundamental_health]
+
+            model = genai.GenerativeModel(
+                model_name='gemini-2.0-flash',
+                tools=tools,
+                system_instruction=_SYSTEM_INSTRUCTION
+            )
+            # Bind the client for this key now rather than on first send
+            model._client = genai_client.get_default_generative_client()
+            _MODELS[key_digest] = model
+            if len(_MODELS) > _MAX_MODELS:
+                _MODELS.popitem(last=False)
+        else:
+            _MODELS.move_to_end(key_digest)
+    return model
+
+
 def initialize_agent(api_key: str):
     """
     Initialize the Google Gemini AI agent with multi-agent tools.
@@ -229,23 +689,7 @@ def initialize_agent(api_key: str):
     if not api_key or not api_key.strip():
         raise ValueError("API key is required. Please provide a valid Google API key.")
     
-    # Configure Google Generative AI with the provided API key
-    genai.configure(api_key=api_key.strip())
-    
-    tools = [get_ml_prediction, get_technical_analysis, get_fundamental_health]
-    
-    model = genai.GenerativeModel(
-        model_name='gemini-2.0-flash', 
-        tools=tools,
-        system_instruction="""
-        You are a Hedge Fund Manager.
-        1. ALWAYS run `get_ml_prediction` first.
-        2. If the ML tool returns an "error" field, tell the user "I couldn't run the ML model because [reason]".
-        3. Otherwise, combine ML, Technicals, and Fundamentals into a trading recommendation.
-        """
-    )
-    
-    return model.start_chat(enable_automatic_function_calling=True)
+    return _get_model(api_key.strip()).start_chat(enable_automatic_function_calling=True)
 
 
 def analyze_stock(ticker: str, chat_instance=None, api_key: str = None) -> str:
@@ -284,6 +728,28 @@ def analyze_stock(ticker: str, chat_instance=None, api_key: str = None) -> str:
         return f"Agent Error: {str(e)}"
 
 
+async def analyze_stocks(tickers: list, api_key: str) -> list:
+    """
+    Analyze several stocks concurrently.
+
+    Each ticker runs in its own thread with its own chat instance, since a
+    chat session is not safe to share across threads.
+
+    Args:
+        tickers (list): Stock ticker symbols to analyze
+        api_key (str): Google API key used to initialize each agent
+
+    Returns:
+        list: AI-generated recommendation (or error message) per ticker,
+            in the same order as tickers
+    """
+    # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(None, analyze_stock, ticker, None, api_key) for ticker in tickers)
+    )
+
+
 # ============================================================================
 # Streamlit UI Mode
 # ============================================================================
@@ -300,6 +766,7 @@ if __name__ == "__main__":
     
     Commands:
         - Enter stock ticker: Analyzes the stock and displays recommendation
+        - Enter comma-separated tickers: Analyzes them concurrently
         - 'quit': Exits the application
     """
     print("\n🤖 Multi-Agent Stock Analyst - CLI Mode")
@@ -322,13 +789,22 @@ if __name__ == "__main__":
         sys.exit(1)
     
     while True:
-        user_input = input("Stock Ticker (or 'quit'): ")
+        user_input = input("Stock Ticker(s), comma-separated (or 'quit'): ")
         if user_input.lower() == "quit":
             break
         
+        tickers = [t.strip() for t in user_input.split(",") if t.strip()]
+        if not tickers:
+            continue
         try:
-            response = analyze_stock(user_input, chat)
-            print(response)
+            if len(tickers) == 1:
+                response = analyze_stock(tickers[0], chat)
+                print(response)
+            else:
+                responses = asyncio.run(analyze_stocks(tickers, api_key))
+                for ticker, response in zip(tickers, responses):
+                    print(f"\n===== {ticker.upper()} =====")
+                    print(response)
         except Exception as e:
             print(f"Agent Error: {e}")
 
@@ -0,0 +1,3 @@
+"""
+Shared UI helpers for the Streamlit pages.
+"""
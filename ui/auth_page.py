@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Common setup and HTML snippets for the authentication pages.
+"""
+
+import html
+from functools import lru_cache
+
+import streamlit as st
+
+from ui.styles import inject_auth_css
+
+
+def setup_auth_page(title: str, css_page: str, redirect_if_authenticated: bool = False):
+    """
+    Configure an authentication page and inject its CSS.
+
+    Streamlit applies the page config per run, so this is called at the top
+    of every run of the page.
+
+    Args:
+        title (str): Page title, e.g. "Sign In"
+        css_page (str): Page name passed to inject_auth_css
+        redirect_if_authenticated (bool): Send signed-in users to the main
+            app before any styling work. Defaults to False.
+    """
+    st.set_page_config(
+        page_title=f"{title} - Multi-Agent Stock Analyst",
+        page_icon="📈",
+        layout="centered",
+        initial_sidebar_state="collapsed"
+    )
+
+    if redirect_if_authenticated and st.session_state.get('authenticated'):
+        st.switch_page("app.py")
+
+    inject_auth_css(css_page)
+
+
+@lru_cache(maxsize=1024)
+def user_email_html(action: str, email: str) -> str:
+    """
+    Get the HTML box naming the account a page acts on.
+
+    Cached here rather than in the page, since page scripts are re-executed
+    (and their functions redefined) on every run.
+
+    Args:
+        action (str): Leading text, e.g. "Resetting password for"
+        email (str): User's email address (HTML-escaped on output)
+
+    Returns:
+        str: HTML for the user email box
+    """
+    return f'<div class="user-email">{action} <strong>{html.escape(email)}</strong></div>'
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Shared CSS for the authentication pages.
+
+The sign in, sign up, password reset and email verification pages share
+one stylesheet, ui/auth-common.css; each page adds a small
+ui/auth-<page>.css with its primary button colors and page-specific rules.
+"""
+
+import re
+from pathlib import Path
+
+import streamlit as st
+
+
+# Stylesheets live next to this module
+_CSS_DIR = Path(__file__).parent
+
+
+def _minify_css(css: str) -> str:
+    """
+    Minify CSS by dropping comments and unneeded whitespace.
+
+    Args:
+        css (str): CSS source
+
+    Returns:
+        str: Equivalent minified CSS
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@st.cache_resource(show_spinner=False)
+def _css_blob(page: str) -> str:
+    """
+    Build the complete <style> tag for a page, once per process.
+
+    Args:
+        page (str): Page name, selecting ui/auth-<page>.css
+
+    Returns:
+        str: <style> element with the minified shared and page CSS
+    """
+    css = (
+        (_CSS_DIR / "auth-common.css").read_text(encoding="utf-8")
+        + (_CSS_DIR / f"auth-{page}.css").read_text(encoding="utf-8")
+    )
+    return "<style>" + _minify_css(css) + "</style>"
+
+
+def inject_auth_css(page: str):
+    """
+    Inject the shared authentication page CSS plus the page's own rules.
+
+    Streamlit drops elements that a rerun does not re-emit, so this is called
+    on every run; the stylesheets are read from disk and assembled only once
+    per process.
+
+    Args:
+        page (str): Page name, e.g. "signin", "signup" or "reset-password"
+    """
+    st.markdown(_css_blob(page), unsafe_allow_html=True)